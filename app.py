@@ -1,15 +1,86 @@
 print("Streamlit app is starting up...")
 
 try:
+    import re
+    import logging
+    import time
+    import threading
     import streamlit as st
-    import pandas as pd
-    import plotly.express as px
-    from utils.data_fetcher import get_stock_info, get_options_chain
-    from utils.options_calculator import process_options_data
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    from concurrent.futures import ThreadPoolExecutor
+    from utils.data_fetcher import get_stock_info, get_options_chain, clear_http_cache
+    from utils.options_calculator import process_options_data, get_filter_defaults
 except Exception as e:
     print("Import error:", e)
     raise
 
+# Show INFO summaries from utils; per-row DEBUG lines are skipped at the level check
+logging.basicConfig(level=logging.INFO)
+
+# Cache market data so widget-triggered reruns don't refetch from Yahoo Finance
+CACHE_TTL_SECONDS = 300
+
+# Largest number of points drawn on the ROI scatter before sampling
+MAX_CHART_POINTS = 5000
+
+# Rows sent to the options table per page
+TABLE_PAGE_SIZE = 500
+
+# Symbols Yahoo Finance can resolve, e.g. AAPL, BRK-B, ^SPX; anything else skips the network call
+TICKER_PATTERN = re.compile(r'\^?[A-Z0-9.\-]{1,10}')
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def cached_market_data(ticker_symbol, option_type, max_days, _stock_status=None, _options_status=None):
+    # The status placeholders are underscore-prefixed so they stay out of the cache key.
+    # The fetchers draw their retry progress into them from worker threads, which need this run's script context.
+    ctx = get_script_run_ctx()
+
+    def run_in_script_context(fetch, *args, **kwargs):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fetch(*args, **kwargs)
+
+    # The quote and the options chain are independent requests, so fetch them concurrently.
+    # The fetch time identifies this particular download, so results derived from it can be keyed on it.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        stock_future = executor.submit(run_in_script_context, get_stock_info, ticker_symbol,
+                                       status_placeholder=_stock_status)
+        options_future = executor.submit(run_in_script_context, get_options_chain, ticker_symbol, option_type, max_days,
+                                         status_placeholder=_options_status)
+        return stock_future.result(), options_future.result(), time.time()
+
+# Table column formats, applied client-side so the columns stay numeric and sort correctly
+COLUMN_CONFIG = {
+    "Annualized ROI (%)": st.column_config.NumberColumn(
+        "Annualized ROI (%)",
+        format="%.2f%%",
+    ),
+    "Strike Price": st.column_config.NumberColumn(
+        "Strike Price",
+        help="Option strike price",
+        format="$%.2f"
+    ),
+    "Premium": st.column_config.NumberColumn(
+        "Market Premium",
+        help="Lower of Bid and Ask prices",
+        format="$%.2f"
+    ),
+    "Bid": st.column_config.NumberColumn(
+        "Bid",
+        help="Bid price",
+        format="$%.2f"
+    ),
+    "Ask": st.column_config.NumberColumn(
+        "Ask",
+        help="Ask price",
+        format="$%.2f"
+    ),
+    "Implied Volatility": st.column_config.NumberColumn(
+        "Implied Volatility",
+        help="Option implied volatility",
+        format="%.2f%%"
+    )
+}
+
 # Page configuration
 st.set_page_config(
     page_title="Options ROI Calculator",
@@ -48,15 +119,22 @@ _Data is sourced from Yahoo Finance and updates regularly during market hours (s
 """)
 
 # Main input controls
-col1, col2 = st.columns([2, 2])
+col1, col2, col3 = st.columns([2, 2, 2])
 with col1:
-    ticker = st.text_input("Enter Stock Ticker", value="AAPL").upper()
+    ticker = st.text_input("Enter Stock Ticker", value="AAPL").strip().upper()
 with col2:
     option_type = st.selectbox(
         "Option Type",
         ["both", "call", "put"],
         format_func=lambda x: x.upper()
     )
+with col3:
+    # Limiting the window skips requesting the later expirations at all
+    max_expiry_days = st.selectbox(
+        "Expirations Within",
+        [None, 30, 60, 90, 180, 365],
+        format_func=lambda x: "All dates" if x is None else f"{x} days"
+    )
 
 # Sidebar with instructions
 with st.sidebar:
@@ -72,10 +150,19 @@ with st.sidebar:
     - Wait a few seconds between searches
     - Try different tickers if one is rate limited
     - Refresh the page if needed
+
+    Market data is cached for a few minutes.
     """)
 
+    if st.button("Clear cached data"):
+        # Both layers, so the next lookup fetches fresh quotes from Yahoo Finance
+        st.cache_data.clear()
+        clear_http_cache()
+
 # Main content
-if ticker:
+if ticker and not TICKER_PATTERN.fullmatch(ticker):
+    st.info("💡 Enter a valid ticker symbol: letters, digits, '.' or '-', up to 10 characters.")
+elif ticker:
     # Create placeholder for status messages
     status_placeholder = st.empty()
 
@@ -84,14 +171,19 @@ if ticker:
         st.write('Fetching market data... This may take a few moments.')
         progress_bar = st.progress(0)
 
-    # Pass the status placeholder to the function
-    stock_info = get_stock_info(ticker, status_placeholder=status_placeholder)
+        # Each fetcher shows its own rate-limit retries here
+        stock_status = st.empty()
+        options_status = st.empty()
+
+    stock_info, options_data, fetched_at = cached_market_data(ticker, option_type, max_expiry_days, stock_status, options_status)
 
     # Clear the placeholder after data fetching is complete
     status_placeholder.empty()
 
     if stock_info:
         if isinstance(stock_info, dict) and "error" in stock_info:
+            # Don't keep serving a failed lookup from the cache
+            cached_market_data.clear(ticker, option_type, max_expiry_days)
             st.error(stock_info["error"])
 
             # Display technical details in an expandable section if available
@@ -110,22 +202,10 @@ if ticker:
             with col3:
                 st.metric("Market Cap", f"${stock_info['market_cap']:,.0f}")
 
-            # Fetch options data
-            # Create placeholder for options status messages
-            options_status_placeholder = st.empty()
-
-            # Display initial loading message
-            with options_status_placeholder.container():
-                st.write('Calculating options ROI... Please wait.')
-                options_progress_bar = st.progress(0)
-
-            # Pass the status placeholder to the function
-            options_data = get_options_chain(ticker, option_type, status_placeholder=options_status_placeholder)
-
-            # Clear the placeholder after data fetching is complete
-            options_status_placeholder.empty()
-
             if isinstance(options_data, dict) and "error" in options_data:
+                # Don't keep serving a failed lookup from the cache
+                cached_market_data.clear(ticker, option_type, max_expiry_days)
+
                 # Display main error message
                 st.error(options_data["error"])
 
@@ -136,126 +216,138 @@ if ticker:
 
                 st.info("💡 Tip: While waiting, you can try searching for a different stock symbol or review the tips in the sidebar.")
             elif options_data is not None:
-                # Process options data
-                results = process_options_data(options_data, stock_info['current_price'])
-
-                if results:
-                    # Convert results to DataFrame
-                    df = pd.DataFrame(results)
+                # Process options data once per download, keyed on its fetch time; filter reruns reuse the stored results.
+                # Widget defaults come from the full result set so they stay stable across filter changes.
+                processed_key = (ticker, option_type, max_expiry_days, fetched_at)
+                if st.session_state.get('processed_key') != processed_key:
+                    results = process_options_data(options_data, stock_info['current_price'])
+                    st.session_state['processed_results'] = results
+                    st.session_state['filter_defaults'] = get_filter_defaults(results) if not results.empty else None
+                    st.session_state['processed_key'] = processed_key
+                results = st.session_state['processed_results']
+
+                if not results.empty:
+                    defaults = st.session_state['filter_defaults']
 
                     # Filters section
                     st.subheader("Filter Options")
 
-                    # Create columns for filters
-                    col1, col2, col3 = st.columns(3)
-
-                    with col1:
-                        min_strike = st.number_input("Min Strike Price",
-                                                   value=float(df['Strike Price'].min()),
-                                                   step=1.0)
-                        max_strike = st.number_input("Max Strike Price",
-                                                   value=float(df['Strike Price'].max()),
+                    # Group filters in a form so edits only rerun the script on submit
+                    with st.form("options_filters"):
+                        col1, col2, col3 = st.columns(3)
+
+                        with col1:
+                            min_strike = st.number_input("Min Strike Price",
+                                                       value=defaults['strike_min'],
+                                                       step=1.0)
+                            max_strike = st.number_input("Max Strike Price",
+                                                       value=defaults['strike_max'],
+                                                       step=1.0)
+                            min_volume = st.number_input("Min Volume",
+                                                       value=5,
+                                                       step=1)
+
+                        with col2:
+                            min_days = st.number_input("Min Days to Expiry",
+                                                     value=0,
+                                                     step=1)
+                            max_days = st.number_input("Max Days to Expiry",
+                                                     value=defaults['days_max'],
+                                                     step=1)
+                            min_open_interest = st.number_input("Min Open Interest",
+                                                              value=5,
+                                                              step=1)
+
+                        with col3:
+                            min_premium = st.number_input("Min Premium",
+                                                        value=defaults['premium_min'],
+                                                        step=0.01)
+                            min_roi = st.number_input("Min Annualized ROI (%)",
+                                                    value=defaults['roi_min'],
+                                                    step=1.0)
+                            min_iv = st.number_input("Min Implied Volatility (%)",
+                                                   value=defaults['iv_min'],
                                                    step=1.0)
-                        min_volume = st.number_input("Min Volume",
-                                                   value=5,
-                                                   step=1)
 
-                    with col2:
-                        min_days = st.number_input("Min Days to Expiry",
-                                                 value=0,
-                                                 step=1)
-                        max_days = st.number_input("Max Days to Expiry",
-                                                 value=int(df['Days to Expiry'].max()),
-                                                 step=1)
-                        min_open_interest = st.number_input("Min Open Interest",
-                                                          value=5,
-                                                          step=1)
-
-                    with col3:
-                        min_premium = st.number_input("Min Premium",
-                                                    value=float(df['Premium'].min()),
-                                                    step=0.01)
-                        min_roi = st.number_input("Min Annualized ROI (%)",
-                                                value=float(df['Annualized ROI (%)'].min()),
-                                                step=1.0)
-                        min_iv = st.number_input("Min Implied Volatility (%)",
-                                               value=float(df['Implied Volatility'].min()),
-                                               step=1.0)
-
-                    # Apply filters
-                    filtered_df = df[
-                        (df['Strike Price'] >= min_strike) &
-                        (df['Strike Price'] <= max_strike) &
-                        (df['Premium'] >= min_premium) &
-                        (df['Volume'] >= min_volume) &
-                        (df['Open Interest'] >= min_open_interest) &
-                        (df['Annualized ROI (%)'] >= min_roi) &
-                        (df['Days to Expiry'] >= min_days) &
-                        (df['Days to Expiry'] <= max_days) &
-                        (df['Implied Volatility'] >= min_iv)
-                    ]
+                        st.form_submit_button("Apply Filters")
+
+                    # Apply the filters on the raw numpy arrays, skipping pandas index alignment
+                    strike_prices = results['Strike Price'].to_numpy()
+                    days_to_expiry = results['Days to Expiry'].to_numpy()
+                    mask = (
+                        (strike_prices >= min_strike) &
+                        (strike_prices <= max_strike) &
+                        (days_to_expiry >= min_days) &
+                        (days_to_expiry <= max_days) &
+                        (results['Volume'].to_numpy() >= min_volume) &
+                        (results['Open Interest'].to_numpy() >= min_open_interest) &
+                        (results['Premium'].to_numpy() >= min_premium) &
+                        (results['Annualized ROI (%)'].to_numpy() >= min_roi) &
+                        (results['Implied Volatility'].to_numpy() >= min_iv)
+                    )
+                    filtered_df = results[mask]
 
                     # Display results
                     st.subheader("Options ROI Analysis")
 
                     if not filtered_df.empty:
-                        # ROI Chart
+                        # ROI Chart, sampled down so render time stays bounded on very wide chains
+                        plot_df = filtered_df
+                        if len(filtered_df) > MAX_CHART_POINTS:
+                            plot_df = filtered_df.sample(MAX_CHART_POINTS, random_state=0)
+
+                        # Imported here so reruns that never draw a chart skip plotly's import cost
+                        import plotly.express as px
+
                         fig = px.scatter(
-                            filtered_df,
+                            plot_df,
                             x='Strike Price',
                             y='Annualized ROI (%)',
                             size='Open Interest',
                             color='Days to Expiry',
-                            hover_data=['Expiry Date', 'Premium', 'Implied Volatility'],
-                            title='ROI vs Strike Price'
+                            title='ROI vs Strike Price',
+                            render_mode='webgl'
+                        )
+                        fig.update_traces(
+                            customdata=plot_df[['Expiry Date', 'Premium', 'Implied Volatility']].to_numpy(),
+                            hovertemplate=(
+                                'Strike Price: $%{x:.2f}<br>'
+                                'Annualized ROI: %{y:.2f}%<br>'
+                                'Open Interest: %{marker.size}<br>'
+                                'Days to Expiry: %{marker.color}<br>'
+                                'Expiry Date: %{customdata[0]}<br>'
+                                'Premium: $%{customdata[1]:.2f}<br>'
+                                'Implied Volatility: %{customdata[2]:.2f}%'
+                                '<extra></extra>'
+                            )
                         )
                         st.plotly_chart(fig, use_container_width=True)
 
+                        if plot_df is not filtered_df:
+                            st.caption(f"Chart shows a random sample of {MAX_CHART_POINTS:,} of {len(filtered_df):,} options. The table below lists all of them.")
+
                         # Detailed data table
                         st.markdown("### Options Data Table")
                         st.markdown("Click on column headers to sort the data.")
 
-                        # Create a copy for display with proper formatting
-                        display_df = filtered_df.copy()
-
-                        # Format the display columns
-                        display_df['Strike Price'] = display_df['Strike Price'].map('${:,.2f}'.format)
-                        display_df['Premium'] = display_df['Premium'].map('${:,.2f}'.format)
-                        display_df['Bid'] = display_df['Bid'].map('${:,.2f}'.format)
-                        display_df['Ask'] = display_df['Ask'].map('${:,.2f}'.format)
-                        display_df['Implied Volatility'] = display_df['Implied Volatility'].map('{:,.2f}%'.format)
+                        # Send the table one page at a time so the payload stays bounded on wide chains
+                        table_df = filtered_df
+                        if len(filtered_df) > TABLE_PAGE_SIZE:
+                            page_count = -(-len(filtered_df) // TABLE_PAGE_SIZE)
+                            page = st.number_input(f"Page (of {page_count})",
+                                                 min_value=1,
+                                                 max_value=page_count,
+                                                 value=1,
+                                                 step=1)
+                            table_df = filtered_df.iloc[(page - 1) * TABLE_PAGE_SIZE:page * TABLE_PAGE_SIZE]
+                            st.caption(f"Showing rows {(page - 1) * TABLE_PAGE_SIZE + 1:,}-{(page - 1) * TABLE_PAGE_SIZE + len(table_df):,} of {len(filtered_df):,}. Sorting applies within the page.")
 
                         # Display dataframe with proper column configuration
                         st.dataframe(
-                            display_df,
+                            table_df,
                             use_container_width=True,
                             hide_index=True,
-                            column_config={
-                                "Annualized ROI (%)": st.column_config.NumberColumn(
-                                    "Annualized ROI (%)",
-                                    format="%.2f%%",
-                                ),
-                                "Strike Price": st.column_config.TextColumn(
-                                    "Strike Price",
-                                    help="Option strike price"
-                                ),
-                                "Premium": st.column_config.TextColumn(
-                                    "Market Premium",
-                                    help="Lower of Bid and Ask prices"
-                                ),
-                                "Bid": st.column_config.TextColumn(
-                                    "Bid",
-                                    help="Bid price"
-                                ),
-                                "Ask": st.column_config.TextColumn(
-                                    "Ask",
-                                    help="Ask price"
-                                ),
-                                "Implied Volatility": st.column_config.TextColumn(
-                                    "Implied Volatility",
-                                    help="Option implied volatility"
-                                )
-                            }
+                            column_config=COLUMN_CONFIG
                         )
 
                     else:
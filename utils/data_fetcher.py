@@ -1,76 +1,266 @@
 import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
+import requests_cache
+from requests import Session
+from requests_ratelimiter import LimiterMixin
+from requests.adapters import HTTPAdapter
 import pandas as pd
+import numpy as np
 import streamlit as st
 import re
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 import time
+import random
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
-# Initialize global variables to store error details
-last_error_message = ""
-last_error_details = ""
+logger = logging.getLogger(__name__)
 
-def get_stock_info(ticker_symbol, max_retries=5, initial_delay=10, status_placeholder=None):
+# HTTP status code embedded in a request error message
+HTTP_STATUS_PATTERN = re.compile(r'status ([0-9]+)')
+
+# Simultaneous Yahoo Finance requests across all sessions. The cap starts at INITIAL_CONCURRENT_REQUESTS and
+# adapts AIMD-style: halved after an options batch that hit a 429 or averaged slower than TARGET_LATENCY_SECONDS,
+# otherwise raised by half a request, never beyond MAX_CONCURRENT_REQUESTS.
+INITIAL_CONCURRENT_REQUESTS = 4
+MAX_CONCURRENT_REQUESTS = 16
+TARGET_LATENCY_SECONDS = 2.0
+
+class AdaptiveConcurrencyLimit:
     """
-    Fetch basic stock information with improved error handling and retry logic
+    Context manager that admits at most `limit` concurrent holders, with the limit tuned from observed calls
+    """
+
+    def __init__(self, initial, max_limit, target_latency, increase=0.5, decrease=0.5):
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._latencies = []
+        self._rate_limited = False
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        return max(1, int(self._limit))
+
+    def __enter__(self):
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+        return False
+
+    def observe(self, latency, rate_limited):
+        with self._condition:
+            self._latencies.append(latency)
+            self._rate_limited = self._rate_limited or rate_limited
+
+    def adjust(self):
+        """
+        Apply the AIMD step for the calls observed since the last adjustment
+        """
+        with self._condition:
+            if not self._latencies:
+                return
+            average_latency = sum(self._latencies) / len(self._latencies)
+            if self._rate_limited or average_latency > self.target_latency:
+                self._limit = max(1.0, self._limit * self.decrease)
+            else:
+                self._limit = min(float(self.max_limit), self._limit + self.increase)
+            logger.debug("Yahoo concurrency limit now %d (avg latency %.2fs, rate limited: %s)",
+                         self.limit, average_latency, self._rate_limited)
+            self._latencies = []
+            self._rate_limited = False
+            self._condition.notify_all()
+
+yahoo_request_slots = AdaptiveConcurrencyLimit(INITIAL_CONCURRENT_REQUESTS, MAX_CONCURRENT_REQUESTS, TARGET_LATENCY_SECONDS)
+
+class SlotLimitedAdapter(HTTPAdapter):
+    """
+    Transport adapter that holds one of yahoo_request_slots only for the network round-trip and reports its latency.
+    Cache hits never reach it, and the session's rate-limit wait happens before it, so neither holds a slot or counts as latency.
     """
-    global last_error_message, last_error_details
-    
+
+    def send(self, request, **kwargs):
+        with yahoo_request_slots:
+            start = time.monotonic()
+            try:
+                response = super().send(request, **kwargs)
+            except Exception as e:
+                yahoo_request_slots.observe(time.monotonic() - start, _is_rate_limit_error(e))
+                raise
+            yahoo_request_slots.observe(time.monotonic() - start, response.status_code == 429)
+        return response
+
+def _is_rate_limit_error(error):
+    """
+    Whether an exception raised by yfinance reports an HTTP 429
+    """
+    if isinstance(error, YFRateLimitError):
+        return True
+    error_str = str(error)
+    return "Too Many Requests" in error_str or "429" in error_str
+
+# Numeric option chain columns narrowed to float32 once fetched
+CHAIN_FLOAT_COLUMNS = [
+    'strike', 'lastPrice', 'bid', 'ask', 'change', 'percentChange',
+    'volume', 'openInterest', 'impliedVolatility'
+]
+
+# Retry waits double from initial_delay up to this cap, then get +/-50% jitter so clients don't retry in lockstep.
+# A Retry-After from Yahoo is honoured up to the same cap.
+MAX_BACKOFF_SECONDS = 60
+
+# On-disk HTTP cache shared by every Yahoo Finance request, so responses survive app restarts.
+# Only successful responses are stored, so rate-limit errors are never replayed. The crumb
+# query parameter is left out of the cache key: yfinance fetches a fresh one after a restart,
+# which would otherwise turn every stored quote and chain into a miss.
+HTTP_CACHE_SECONDS = 900
+
+# Proactive cap on requests sent to Yahoo Finance per minute, so bursts are spread out before they draw a 429.
+# Responses answered from the HTTP cache never reach the limiter and don't count against it.
+YAHOO_REQUESTS_PER_MINUTE = 60
+
+class CachedLimiterSession(requests_cache.CacheMixin, LimiterMixin, Session):
+    """
+    requests session that answers from the HTTP cache first and rate-limits only the requests that go out
+    """
+
+http_session = CachedLimiterSession(
+    '.yf_cache',
+    backend='sqlite',
+    expire_after=HTTP_CACHE_SECONDS,
+    ignored_parameters=[*requests_cache.DEFAULT_IGNORED_PARAMS, 'crumb'],
+    per_minute=YAHOO_REQUESTS_PER_MINUTE,
+)
+
+# Keep one kept-alive connection per concurrent request slot; requests' default pool of 10
+# would discard connections whenever the adaptive limit lets more expirations run at once
+http_adapter = SlotLimitedAdapter(pool_maxsize=MAX_CONCURRENT_REQUESTS)
+http_session.mount('https://', http_adapter)
+http_session.mount('http://', http_adapter)
+
+# End of the wait requested by a 429's Retry-After header, as a time.monotonic() deadline. It is kept per
+# thread, so it only ever reaches the backoff of the fetch whose request was rate limited.
+retry_after_state = threading.local()
+
+def _record_retry_after(response, *args, **kwargs):
+    """
+    Session response hook that remembers, for the requesting thread, when Yahoo's Retry-After on a 429 ends
+    """
+    if response.status_code == 429:
+        wait = _parse_retry_after(response.headers.get('Retry-After'))
+        retry_after_state.deadline = None if wait is None else time.monotonic() + wait
+    return response
+
+def _take_retry_after_deadline():
+    """
+    Return and clear the Retry-After deadline recorded by the current thread, if any
+    """
+    deadline = getattr(retry_after_state, 'deadline', None)
+    retry_after_state.deadline = None
+    return deadline
+
+def _parse_retry_after(header_value):
+    """
+    Convert a Retry-After header (delta-seconds or HTTP date) to seconds, or None if absent/invalid
+    """
+    if not header_value:
+        return None
+    try:
+        return max(0.0, float(header_value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(header_value)
+    except (TypeError, ValueError):
+        return None
+    # A '-0000' offset parses to a naive datetime; HTTP dates are always UTC
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+http_session.hooks['response'].append(_record_retry_after)
+
+def clear_http_cache():
+    """
+    Drop every stored Yahoo Finance response so the next fetch goes to the network
+    """
+    http_session.cache.clear()
+
+def _backoff_delay(attempt, initial_delay, retry_deadline=None):
+    """
+    Wait before the given retry attempt: what is left of Yahoo's Retry-After if it sent one,
+    otherwise capped exponential backoff with jitter. Never longer than MAX_BACKOFF_SECONDS.
+    """
+    if retry_deadline is not None:
+        remaining = retry_deadline - time.monotonic()
+        if remaining > 0:
+            return min(MAX_BACKOFF_SECONDS, remaining + random.random())
+    return min(MAX_BACKOFF_SECONDS, initial_delay * (2 ** attempt)) * (0.5 + random.random())
+
+def _retry_with_backoff(fetch, max_retries, initial_delay, status_placeholder, rate_limited, failed, exhausted):
+    """
+    Call fetch() until it returns, backing off between rate-limited attempts and showing progress in
+    status_placeholder. rate_limited(error_str, http_code) and failed(error_str) build the error dicts
+    returned when the retries run out or a non-rate-limit error occurs; exhausted is returned if no attempt ran.
+    """
+    # Details of the previous failure, kept per call so concurrent fetches don't overwrite each other's
+    last_error_message = ""
+    last_error_details = ""
+    status_widgets = None
+    retry_deadline = None
+
+    # Drop any Retry-After left on this thread by an earlier, unrelated fetch
+    _take_retry_after_deadline()
+
     for attempt in range(max_retries):
         try:
             if attempt > 0:  # Don't sleep on first attempt
-                wait_time = initial_delay * (2 ** attempt)  # Exponential backoff starting from initial_delay
-                print(f"Rate limited. Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
+                wait_time = _backoff_delay(attempt, initial_delay, retry_deadline)
+                logger.warning("Rate limited. Waiting %.1f seconds before retry %d/%d...", wait_time, attempt + 1, max_retries)
                 
                 # Update status message if placeholder is provided
                 if status_placeholder:
-                    with status_placeholder.container():
-                        st.warning(f"Yahoo Finance API rate limit error. Retry {attempt + 1}/{max_retries} in {wait_time} seconds...")
-                        
-                        # Show actual error message if available
-                        if last_error_message:
-                            st.error(last_error_message)
-                        
-                        # Show detailed error info if available
-                        if last_error_details:
+                    # Build the status widgets on the first retry, then update them in place
+                    if status_widgets is None:
+                        with status_placeholder.container():
+                            warning_slot = st.empty()
+                            error_slot = st.empty()
                             with st.expander("Error Details"):
-                                st.code(last_error_details, language="text")
-                        
-                        # Calculate progress as a value between 0.0 and 1.0
-                        progress = min(0.99, attempt / max_retries)
-                        st.progress(progress)
+                                details_slot = st.empty()
+                            progress_bar = st.progress(0.0)
+                        status_widgets = (warning_slot, error_slot, details_slot, progress_bar)
+                    warning_slot, error_slot, details_slot, progress_bar = status_widgets
+
+                    warning_slot.warning(f"Yahoo Finance API rate limit error. Retry {attempt + 1}/{max_retries} in {wait_time:.0f} seconds...")
+                    
+                    # Show actual error message if available
+                    if last_error_message:
+                        error_slot.error(last_error_message)
+                    
+                    # Show detailed error info if available
+                    if last_error_details:
+                        details_slot.code(last_error_details, language="text")
+                    
+                    # Calculate progress as a value between 0.0 and 1.0
+                    progress_bar.progress(min(0.99, attempt / max_retries))
                 
                 time.sleep(wait_time)
 
-            stock = yf.Ticker(ticker_symbol)
-            info = stock.info
-
-            # Add error checking for missing data
-            if not info:
-                error_msg = f"No information found for ticker {ticker_symbol}"
-                print(error_msg)
-                return {"error": error_msg, "details": f"The ticker '{ticker_symbol}' could not be found or returned no data."}
-
-            # Get current price with fallbacks
-            current_price = None
-            price_sources = ['regularMarketPrice', 'currentPrice', 'previousClose']
-
-            for source in price_sources:
-                current_price = info.get(source)
-                if current_price:
-                    print(f"Found price from source: {source}")
-                    break
-
-            if not current_price:
-                error_msg = f"Warning: Could not fetch price for {ticker_symbol}"
-                print(error_msg)
-                return {"error": error_msg, "details": "Price data is not available for this ticker symbol."}
-
-            return {
-                'name': info.get('longName', 'N/A'),
-                'current_price': current_price,
-                'currency': info.get('currency', 'USD'),
-                'market_cap': info.get('marketCap', 0),
-            }
+            return fetch()
+
         except Exception as e:
             error_str = str(e)
             
@@ -78,137 +268,225 @@ def get_stock_info(ticker_symbol, max_retries=5, initial_delay=10, status_placeh
             last_error_message = f"Yahoo Finance API Error: {error_str[:100]}..."
             last_error_details = error_str
             
-            # Check if it's a rate limiting error
-            if "Too Many Requests" in error_str or "429" in error_str:
+            # yfinance raises YFRateLimitError for the 429s it detects itself
+            if _is_rate_limit_error(e):
+                # The 429 may have been seen on an option chain worker thread, which attaches its deadline to the error
+                retry_deadline = getattr(e, 'retry_after_deadline', None) or _take_retry_after_deadline()
+
                 # Extract HTTP status code if present
-                http_code = "Unknown"
-                if "status" in error_str:
-                    try:
-                        code_match = re.search(r'status ([0-9]+)', error_str)
-                        if code_match:
-                            http_code = code_match.group(1)
-                    except:
-                        pass
+                http_code = "429" if isinstance(e, YFRateLimitError) else "Unknown"
+                code_match = HTTP_STATUS_PATTERN.search(error_str)
+                if code_match:
+                    http_code = code_match.group(1)
                 
                 if attempt == max_retries - 1:  # Last attempt
-                    return {
-                        "error": f"We're experiencing high traffic (HTTP {http_code}). Please try again in a few minutes.",
-                        "details": f"Error: {error_str}\n\nYahoo Finance is rate limiting our requests."
-                    }
+                    return rate_limited(error_str, http_code)
                 continue
-            print(f"Error fetching stock info: {error_str}")
-            return {"error": f"Failed to retrieve stock data for {ticker_symbol}", "details": error_str}
-    return {"error": "Maximum retries exceeded", "details": "Failed to fetch stock data after multiple attempts due to persistent errors."}
+            return failed(error_str)
+    return exhausted
 
-def get_options_chain(ticker_symbol, option_type='both', max_retries=5, initial_delay=10, status_placeholder=None):
+def get_stock_info(ticker_symbol, max_retries=5, initial_delay=10, status_placeholder=None):
     """
-    Fetch options chain data with improved error handling and retry logic
+    Fetch basic stock information with improved error handling and retry logic
     """
-    global last_error_message, last_error_details
-    
-    for attempt in range(max_retries):
-        try:
-            if attempt > 0:  # Don't sleep on first attempt
-                wait_time = initial_delay * (2 ** attempt)  # Exponential backoff starting from initial_delay
-                print(f"Rate limited. Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
-                
-                # Update status message if placeholder is provided
-                if status_placeholder:
-                    with status_placeholder.container():
-                        st.warning(f"Yahoo Finance API rate limit error. Retry {attempt + 1}/{max_retries} in {wait_time} seconds...")
-                        
-                        # Show actual error message if available
-                        if last_error_message:
-                            st.error(last_error_message)
-                        
-                        # Show detailed error info if available
-                        if last_error_details:
-                            with st.expander("Error Details"):
-                                st.code(last_error_details, language="text")
-                        
-                        # Calculate progress as a value between 0.0 and 1.0
-                        progress = min(0.99, attempt / max_retries)
-                        st.progress(progress)
-                
-                time.sleep(wait_time)
+    def fetch():
+        # A fresh Ticker per attempt: yfinance marks .info as fetched before requesting it,
+        # so a Ticker whose request failed would keep returning nothing. Connections come from http_session.
+        stock = yf.Ticker(ticker_symbol, session=http_session)
+        info = stock.info
+
+        # Add error checking for missing data
+        if not info:
+            error_msg = f"No information found for ticker {ticker_symbol}"
+            logger.warning(error_msg)
+            return {"error": error_msg, "details": f"The ticker '{ticker_symbol}' could not be found or returned no data."}
+
+        # Get current price with fallbacks
+        current_price = None
+        price_sources = ['regularMarketPrice', 'currentPrice', 'previousClose']
+
+        for source in price_sources:
+            current_price = info.get(source)
+            if current_price:
+                logger.debug("Found price from source: %s", source)
+                break
+
+        if not current_price:
+            error_msg = f"Warning: Could not fetch price for {ticker_symbol}"
+            logger.warning(error_msg)
+            return {"error": error_msg, "details": "Price data is not available for this ticker symbol."}
+
+        return {
+            'name': info.get('longName', 'N/A'),
+            'current_price': current_price,
+            'currency': info.get('currency', 'USD'),
+            'market_cap': info.get('marketCap', 0),
+        }
+
+    def rate_limited(error_str, http_code):
+        return {
+            "error": f"We're experiencing high traffic (HTTP {http_code}). Please try again in a few minutes.",
+            "details": f"Error: {error_str}\n\nYahoo Finance is rate limiting our requests."
+        }
+
+    def failed(error_str):
+        logger.error("Error fetching stock info: %s", error_str)
+        return {"error": f"Failed to retrieve stock data for {ticker_symbol}", "details": error_str}
+
+    return _retry_with_backoff(
+        fetch, max_retries, initial_delay, status_placeholder, rate_limited, failed,
+        {"error": "Maximum retries exceeded", "details": "Failed to fetch stock data after multiple attempts due to persistent errors."}
+    )
+
+def _fetch_expiration(stock, date, want_calls, want_puts):
+    """
+    Fetch the calls and/or puts for a single expiration date as (optionType, date, frame) tuples.
+    Rate-limit errors are raised so the caller can retry; other errors skip the date.
+    """
+    frames = []
+    try:
+        opt = stock.option_chain(date)
+
+        # yfinance returns None for a side with no contracts at this expiration
+        if want_calls and opt.calls is not None and not opt.calls.empty:
+            frames.append(('CALL', date, opt.calls))
+
+        if want_puts and opt.puts is not None and not opt.puts.empty:
+            frames.append(('PUT', date, opt.puts))
+
+    except Exception as e:
+        if _is_rate_limit_error(e):
+            # Hand this thread's Retry-After to the retry loop, which runs on another thread
+            e.retry_after_deadline = _take_retry_after_deadline()
+            raise
+        logger.warning("Error processing options for date %s: %s", date, e)
+        return []
+
+    return frames
+
+def _stack_frames(frames):
+    """
+    Concatenate option chain frames, stacking plain numpy columns directly when every frame has the same columns
+    """
+    columns = frames[0].columns
+    if not all(frame.columns.equals(columns) for frame in frames[1:]):
+        if not all(set(frame.columns) == set(columns) for frame in frames[1:]):
+            return pd.concat(frames, ignore_index=True, sort=False)
+        # Same columns in a different order: align them so the fast path still applies
+        frames = [frame if frame.columns.equals(columns) else frame[columns] for frame in frames]
+
+    stacked = {}
+    for column in columns:
+        parts = [frame[column] for frame in frames]
+        if all(isinstance(part.dtype, np.dtype) for part in parts):
+            stacked[column] = np.concatenate([part.to_numpy() for part in parts])
+        else:
+            # Extension dtypes (tz-aware timestamps, strings) keep pandas' own concatenation
+            stacked[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(stacked, columns=columns, copy=False)
 
-            stock = yf.Ticker(ticker_symbol)
-            expirations = stock.options
+def get_options_chain(ticker_symbol, option_type='both', max_days=None, max_retries=5, initial_delay=10, status_placeholder=None):
+    """
+    Fetch options chain data with improved error handling and retry logic.
+    Expirations more than max_days out are skipped without being requested.
+    """
+    # Expiration dates and the frames fetched so far survive retries, so a retry only requests what is still missing
+    expirations = None
+    fetched = {}
+
+    def fetch():
+        nonlocal expirations
+        stock = yf.Ticker(ticker_symbol, session=http_session)
+
+        # Reading .options also loads the date lookup option_chain() needs on this fresh Ticker.
+        # On a retry the response comes from the HTTP cache; the dates already chosen are kept.
+        available = stock.options
 
-            if not expirations:
+        if expirations is None:
+            if not available:
                 error_msg = f"No options expirations found for {ticker_symbol}"
-                print(error_msg)
+                logger.warning(error_msg)
                 return {"error": error_msg, "details": "No options data available for this ticker symbol."}
 
-            print(f"Found {len(expirations)} expiration dates for {ticker_symbol}")
+            logger.debug("Found %d expiration dates for %s", len(available), ticker_symbol)
 
-            all_options = []
-            for date in expirations:
-                try:
-                    opt = stock.option_chain(date)
-
-                    if option_type in ['call', 'both']:
-                        calls = opt.calls
-                        calls['optionType'] = 'CALL'
-                        calls['expirationDate'] = date
-                        calls = calls[calls['lastPrice'] > 0]
-                        all_options.append(calls)
-
-                    if option_type in ['put', 'both']:
-                        puts = opt.puts
-                        puts['optionType'] = 'PUT'
-                        puts['expirationDate'] = date
-                        puts = puts[puts['lastPrice'] > 0]
-                        all_options.append(puts)
+            if max_days is not None:
+                cutoff = (datetime.now() + timedelta(days=max_days)).strftime('%Y-%m-%d')
+                available = [date for date in available if date <= cutoff]
+
+                if not available:
+                    error_msg = f"No options expirations within {max_days} days for {ticker_symbol}"
+                    logger.warning(error_msg)
+                    return {"error": error_msg, "details": "Try a longer expiration window."}
+
+            expirations = available
 
+        # Each expiration is a separate HTTP round-trip, so fetch them concurrently.
+        # Rate-limited dates are left out of fetched and requested again on the next attempt.
+        want_calls = option_type != 'put'
+        want_puts = option_type != 'call'
+        pending = [date for date in expirations if date not in fetched]
+        rate_limit_error = None
+        with ThreadPoolExecutor(max_workers=yahoo_request_slots.limit) as executor:
+            futures = {date: executor.submit(_fetch_expiration, stock, date, want_calls, want_puts) for date in pending}
+            for date, future in futures.items():
+                try:
+                    fetched[date] = future.result()
                 except Exception as e:
-                    print(f"Error processing options for date {date}: {str(e)}")
-                    continue
+                    rate_limit_error = e
+        yahoo_request_slots.adjust()
 
-            if not all_options:
-                error_msg = "No valid options data found"
-                print(error_msg)
-                return {"error": error_msg, "details": f"Could not retrieve any valid options data for {ticker_symbol}."}
+        if rate_limit_error is not None:
+            raise rate_limit_error
 
-            combined_options = pd.concat(all_options)
-            combined_options = combined_options.dropna(subset=['strike', 'lastPrice', 'bid', 'ask'])
+        all_options = [frame for date in expirations for frame in fetched[date]]
 
-            if combined_options.empty:
-                error_msg = "No valid options data after filtering"
-                print(error_msg)
-                return {"error": error_msg, "details": "Data was retrieved but contained no valid options after filtering."}
+        if not all_options:
+            error_msg = "No valid options data found"
+            logger.warning(error_msg)
+            return {"error": error_msg, "details": f"Could not retrieve any valid options data for {ticker_symbol}."}
 
-            print(f"Successfully processed {len(combined_options)} options contracts")
-            return combined_options
+        # Concatenate the raw frames once, then label and filter the combined frame in single vectorized passes
+        option_types, dates, frames = zip(*all_options)
+        lengths = [len(frame) for frame in frames]
+        combined_options = _stack_frames(frames)
 
-        except Exception as e:
-            error_str = str(e)
-            
-            # Store the error details for display during retries
-            last_error_message = f"Yahoo Finance API Error: {error_str[:100]}..."
-            last_error_details = error_str
-            
-            # Check if it's a rate limiting error
-            if "Too Many Requests" in error_str or "429" in error_str:
-                # Extract HTTP status code if present
-                http_code = "Unknown"
-                if "status" in error_str:
-                    try:
-                        code_match = re.search(r'status ([0-9]+)', error_str)
-                        if code_match:
-                            http_code = code_match.group(1)
-                    except:
-                        pass
-                
-                if attempt == max_retries - 1:  # Last attempt
-                    error_msg = f"Rate limit reached for options data (HTTP {http_code})"
-                    print(error_msg)
-                    return {
-                        "error": f"Data retrieval rate limit exceeded (HTTP {http_code})", 
-                        "details": f"Error: {error_str}\n\nThe Yahoo Finance API is limiting our requests. Please try again in a few minutes."
-                    }
-                continue
-            error_msg = f"Error in get_options_chain: {error_str}"
-            print(error_msg)
-            return {"error": "Failed to retrieve options data", "details": error_str}
-    return {"error": "Maximum retries exceeded", "details": "Failed to fetch options data after multiple attempts."}
\ No newline at end of file
+        # Both label columns repeat a handful of values, so store them as categoricals
+        combined_options['optionType'] = pd.Categorical(np.repeat(option_types, lengths), categories=['CALL', 'PUT'])
+        combined_options['expirationDate'] = pd.Categorical(np.repeat(dates, lengths))
+
+        # Keep traded contracts with complete prices; build one mask and only slice if something survives
+        valid = (
+            (combined_options['lastPrice'].to_numpy() > 0) &
+            combined_options[['strike', 'lastPrice', 'bid', 'ask']].notna().to_numpy().all(axis=1)
+        )
+
+        if not valid.any():
+            error_msg = "No valid options data after filtering"
+            logger.warning(error_msg)
+            return {"error": error_msg, "details": "Data was retrieved but contained no valid options after filtering."}
+
+        combined_options = combined_options[valid]
+
+        # Prices, strikes and volumes don't need double precision; float32 halves their footprint
+        float_columns = combined_options.columns.intersection(CHAIN_FLOAT_COLUMNS)
+        combined_options = combined_options.astype(dict.fromkeys(float_columns, 'float32'))
+
+        logger.debug("Successfully processed %d options contracts", len(combined_options))
+        return combined_options
+
+    def rate_limited(error_str, http_code):
+        logger.warning("Rate limit reached for options data (HTTP %s)", http_code)
+        return {
+            "error": f"Data retrieval rate limit exceeded (HTTP {http_code})", 
+            "details": f"Error: {error_str}\n\nThe Yahoo Finance API is limiting our requests. Please try again in a few minutes."
+        }
+
+    def failed(error_str):
+        logger.error("Error in get_options_chain: %s", error_str)
+        return {"error": "Failed to retrieve options data", "details": error_str}
+
+    return _retry_with_backoff(
+        fetch, max_retries, initial_delay, status_placeholder, rate_limited, failed,
+        {"error": "Maximum retries exceeded", "details": "Failed to fetch options data after multiple attempts."}
+    )
@@ -1,5 +1,16 @@
+import logging
 import numpy as np
+import pandas as pd
 from datetime import datetime
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Columns of the DataFrame returned by process_options_data, in display order
+OPTIONS_COLUMNS = [
+    'Strike Price', 'Expiry Date', 'Premium', 'Bid', 'Ask', 'Days to Expiry',
+    'Volume', 'Open Interest', 'Implied Volatility', 'Annualized ROI (%)', 'Option Type'
+]
 
 def calculate_annualized_roi(premium, strike_price, days_to_expiry):
     """
@@ -7,7 +18,7 @@ def calculate_annualized_roi(premium, strike_price, days_to_expiry):
     """
     try:
         if premium <= 0 or strike_price <= 0 or days_to_expiry <= 0:
-            print(f"Invalid input: premium={premium}, strike={strike_price}, days={days_to_expiry}")
+            logger.debug("Invalid input: premium=%s, strike=%s, days=%s", premium, strike_price, days_to_expiry)
             return 0
 
         # Calculate raw ROI
@@ -18,12 +29,16 @@ def calculate_annualized_roi(premium, strike_price, days_to_expiry):
 
         return round(annualized_roi, 2)
     except ZeroDivisionError:
-        print("Division by zero error in ROI calculation")
+        logger.debug("Division by zero error in ROI calculation")
         return 0
     except Exception as e:
-        print(f"Error calculating ROI: {str(e)}")
+        logger.debug("Error calculating ROI: %s", e)
         return 0
 
+@lru_cache(maxsize=256)
+def _parse_expiry(expiry_str):
+    return datetime.strptime(expiry_str, '%Y-%m-%d')
+
 def calculate_days_to_expiry(expiry_date):
     """
     Calculate days until option expiration
@@ -31,14 +46,13 @@ def calculate_days_to_expiry(expiry_date):
     try:
         # Convert expiry_date to string if it's not already
         expiry_str = str(expiry_date)
-        print(f"Processing expiry date: {expiry_str}")
 
         # Try to parse the date
-        expiry = datetime.strptime(expiry_str, '%Y-%m-%d')
+        expiry = _parse_expiry(expiry_str)
         days = (expiry - datetime.now()).days
         return max(days, 0)
     except Exception as e:
-        print(f"Error calculating days to expiry: {str(e)}")
+        logger.debug("Error calculating days to expiry: %s", e)
         return 0
 
 def process_options_data(options_chain, current_stock_price):
@@ -46,59 +60,79 @@ def process_options_data(options_chain, current_stock_price):
     Process options chain data and calculate ROI, filtering out strategically irrelevant options
     """
     if options_chain is None or options_chain.empty:
-        print("No options chain data to process")
-        return []
-
-    results = []
-
-    for _, row in options_chain.iterrows():
-        try:
-            # Skip PUT options above current price and CALL options below current price
-            if (row['optionType'] == 'PUT' and row['strike'] > current_stock_price) or \
-               (row['optionType'] == 'CALL' and row['strike'] < current_stock_price):
-                continue
-
-            days_to_expiry = calculate_days_to_expiry(row['expirationDate'])
-            if days_to_expiry == 0:
-                continue
-
-            # Get the bid and ask prices
-            bid_price = row['bid']
-            ask_price = row['ask']
-
-            if bid_price <= 0 or ask_price <= 0:
-                continue
-
-            # Use the lower of Bid and Ask as the Market Premium
-            premium = min(bid_price, ask_price)
-
-            if premium <= 0:
-                continue
-
-            roi = calculate_annualized_roi(
-                premium=premium,
-                strike_price=row['strike'],
-                days_to_expiry=days_to_expiry
-            )
-
-            if roi > 0:  # Only include valid ROI calculations
-                results.append({
-                    'Strike Price': row['strike'],
-                    'Expiry Date': row['expirationDate'],
-                    'Premium': premium,
-                    'Bid': bid_price,
-                    'Ask': ask_price,
-                    'Days to Expiry': days_to_expiry,
-                    'Volume': row['volume'],
-                    'Open Interest': row['openInterest'],
-                    'Implied Volatility': round(row['impliedVolatility'] * 100, 2),
-                    'Annualized ROI (%)': roi,
-                    'Option Type': row['optionType']
-                })
-
-        except Exception as e:
-            print(f"Error processing row: {str(e)}")
-            continue
-
-    print(f"Processed {len(results)} valid options")
-    return results
\ No newline at end of file
+        logger.info("No options chain data to process")
+        return pd.DataFrame(columns=OPTIONS_COLUMNS)
+
+    # Whole days until each expiration. A chain has only a few distinct expirations,
+    # so parse each once against a single clock reading and map rows through the category codes.
+    expirations = options_chain['expirationDate'].astype('category')
+    expiry = pd.to_datetime(expirations.cat.categories.astype(str), format='%Y-%m-%d')
+    days_by_expiry = (expiry - pd.Timestamp.now()).days.to_numpy().clip(min=0)
+    days_to_expiry = days_by_expiry[expirations.cat.codes.to_numpy()]
+
+    # Read each column into a numpy array once; the gates and the ROI formula below are plain numpy operations on them
+    option_type = options_chain['optionType']
+    is_put = (option_type == 'PUT').to_numpy()
+    is_call = (option_type == 'CALL').to_numpy()
+    strike_price = options_chain['strike'].to_numpy(dtype=np.float64)
+    bid_price = options_chain['bid'].to_numpy(dtype=np.float64)
+    ask_price = options_chain['ask'].to_numpy(dtype=np.float64)
+
+    # Drop rows before computing anything on them: PUT options above current price, CALL options
+    # below current price, contracts expiring today or earlier, and non-positive bids, asks or strikes
+    keep = (
+        ~((is_put & (strike_price > current_stock_price)) | (is_call & (strike_price < current_stock_price))) &
+        (days_to_expiry > 0) &
+        (bid_price > 0) &
+        (ask_price > 0) &
+        (strike_price > 0)
+    )
+    rows = np.flatnonzero(keep)
+
+    # Use the lower of Bid and Ask as the Market Premium
+    premium = np.minimum(bid_price[rows], ask_price[rows])
+    roi = np.round(premium / strike_price[rows] * 100 * 365 / days_to_expiry[rows], 2)
+
+    # Only include valid ROI calculations
+    valid = roi > 0
+    rows = rows[valid]
+
+    # Gather every output column through the surviving row positions once
+    results = pd.DataFrame({
+        'Strike Price': strike_price[rows],
+        'Expiry Date': options_chain['expirationDate'].array[rows],
+        'Premium': premium[valid],
+        'Bid': bid_price[rows],
+        'Ask': ask_price[rows],
+        'Days to Expiry': days_to_expiry[rows],
+        'Volume': options_chain['volume'].to_numpy()[rows],
+        'Open Interest': options_chain['openInterest'].to_numpy()[rows],
+        'Implied Volatility': np.round(options_chain['impliedVolatility'].to_numpy(dtype=np.float64)[rows] * 100, 2),
+        'Annualized ROI (%)': roi[valid],
+        'Option Type': option_type.array[rows]
+    })
+
+    # Integer columns downcast losslessly; Volume stays float when Yahoo leaves gaps
+    int_columns = ['Days to Expiry', 'Volume', 'Open Interest']
+    results[int_columns] = results[int_columns].apply(pd.to_numeric, downcast='integer')
+
+    # Prices, IV and ROI only need float32. The filter defaults are read back from these same
+    # float32 values, so a threshold taken from a row still matches that row exactly.
+    float_columns = ['Strike Price', 'Premium', 'Bid', 'Ask', 'Implied Volatility', 'Annualized ROI (%)']
+    results[float_columns] = results[float_columns].astype('float32')
+
+    logger.info("Processed %d valid options (%d dropped)", len(results), len(options_chain) - len(results))
+    return results
+
+def get_filter_defaults(results):
+    """
+    Compute the ranges used as filter widget defaults from the processed results
+    """
+    return {
+        'strike_min': float(results['Strike Price'].min()),
+        'strike_max': float(results['Strike Price'].max()),
+        'days_max': int(results['Days to Expiry'].max()),
+        'premium_min': float(results['Premium'].min()),
+        'roi_min': float(results['Annualized ROI (%)'].min()),
+        'iv_min': float(results['Implied Volatility'].min()),
+    }